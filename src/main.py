@@ -1,23 +1,25 @@
 import asyncio
-import json
-import uuid
+import itertools
+import logging
+import secrets
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import AsyncIterator, Dict, List, Optional
+from typing import AsyncIterator, Deque, Dict, List, Mapping, Optional
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 from pydantic import ValidationError
-from starlette.concurrency import iterate_in_threadpool
 
 from src.sequential_thinking.models import ThoughtData
 from src.sequential_thinking.team import create_sequential_thinking_team, Team
+from src.sequential_thinking.serialization import json_dumps, json_loads
 from src.sequential_thinking.settings import settings
 from src.sequential_thinking.log import (
     setup_logging,
+    shutdown_logging,
     format_thought_for_log,
     log_request,
 )
@@ -41,52 +43,81 @@ class AppContext:
     """Holds shared application resources, like the Pydantic team."""
 
     team: Team
-    thought_history: List[ThoughtData] = field(default_factory=list)
-    branches: Dict[str, List[ThoughtData]] = field(default_factory=dict)
+    thought_history: Deque[ThoughtData] = field(
+        default_factory=lambda: deque(maxlen=settings.MAX_THOUGHT_HISTORY or None)
+    )
+    branches: Dict[str, Deque[ThoughtData]] = field(default_factory=dict)
+    # thoughtNumber -> thoughts with that number, oldest first (branches reuse numbers)
+    thoughts_by_number: Dict[int, Deque[ThoughtData]] = field(default_factory=dict)
+    _branch_counts: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
 
     def add_thought(self, thought: ThoughtData) -> None:
         """Add a thought to history and manage branches"""
-        self.thought_history.append(thought)
+        history = self.thought_history
+        if history.maxlen is not None and len(history) == history.maxlen:
+            # The oldest thought is about to be evicted: it is also the oldest
+            # one of its number and of its branch, drop it from those too
+            self._forget(history.popleft())
+        history.append(thought)
+        self.thoughts_by_number.setdefault(thought.thoughtNumber, deque()).append(
+            thought
+        )
 
         # Handle branching
         if thought.branchFromThought is not None and thought.branchId is not None:
-            if thought.branchId not in self.branches:
-                self.branches[thought.branchId] = []
-            self.branches[thought.branchId].append(thought)
+            self.branches.setdefault(thought.branchId, deque()).append(thought)
+            self._branch_counts[thought.branchId] = (
+                self._branch_counts.get(thought.branchId, 0) + 1
+            )
+
+    def _forget(self, thought: ThoughtData) -> None:
+        same_number = self.thoughts_by_number[thought.thoughtNumber]
+        same_number.popleft()
+        if not same_number:
+            del self.thoughts_by_number[thought.thoughtNumber]
+
+        if thought.branchFromThought is not None and thought.branchId is not None:
+            branch = self.branches[thought.branchId]
+            branch.popleft()
+            if branch:
+                self._branch_counts[thought.branchId] -= 1
+            else:
+                del self.branches[thought.branchId]
+                del self._branch_counts[thought.branchId]
+
+    def get_thought(self, thought_number: int) -> Optional[ThoughtData]:
+        """Get the first thought kept in the history with this number"""
+        same_number = self.thoughts_by_number.get(thought_number)
+        return same_number[0] if same_number else None
 
     def get_branch_thoughts(self, branch_id: str) -> List[ThoughtData]:
         """Get all thoughts in a specific branch"""
-        return self.branches.get(branch_id, [])
+        return list(self.branches.get(branch_id, ()))
 
-    def get_all_branches(self) -> Dict[str, int]:
-        """Get all branch IDs and their thought counts"""
-        return {
-            branch_id: len(thoughts) for branch_id, thoughts in self.branches.items()
-        }
+    def get_all_branches(self) -> Mapping[str, int]:
+        """Get all branch IDs and their thought counts (read-only, kept up to date by add_thought)"""
+        return self._branch_counts
 
 
 app_context: Optional[AppContext] = None
+_app_context_lock = asyncio.Lock()
 
 
 # Initialize FastMCP =========================================
 mcp = FastMCP("HighfeatureMcpServerSequentialThinking")
-# --- MCP Handlers ---
 
 
-@mcp.prompt("sequential-thinking")
-def sequential_thinking_prompt(problem: str, context: str = ""):
-    """
-    Starter prompt for sequential thinking that ENCOURAGES non-linear exploration
-    using coordinate mode. Returns separate user and assistant messages.
-    """
-    min_thoughts = 5  # Set a reasonable minimum number of initial thoughts
+# --- Prompt templates (only the placeholders vary between calls) ---
+_MIN_THOUGHTS = 5  # Set a reasonable minimum number of initial thoughts
 
-    user_prompt_text = f"""Initiate a comprehensive sequential thinking process for the following problem:
+_USER_PROMPT_PREFIX = """Initiate a comprehensive sequential thinking process for the following problem:
 
     Problem: {problem}
-    {f'Context: {context}' if context else ''}"""
+    """
+# Indexed by bool(context)
+_USER_PROMPT_TMPL = (_USER_PROMPT_PREFIX, _USER_PROMPT_PREFIX + "Context: {context}")
 
-    assistant_guidelines = f"""Okay, let's start the sequential thinking process. Here are the guidelines and the process we'll follow using the 'coordinate' mode team:
+_ASSISTANT_GUIDELINES_TMPL = """Okay, let's start the sequential thinking process. Here are the guidelines and the process we'll follow using the 'coordinate' mode team:
 
     **Sequential Thinking Goals & Guidelines (Coordinate Mode)**:
 
@@ -108,6 +139,31 @@ def sequential_thinking_prompt(problem: str, context: str = ""):
 
     Proceed with the first thought based on these guidelines."""
 
+# --- Guidance appended to the Coordinator's response ---
+_GUIDANCE_FINAL = (
+    "\n\nThis is the final thought. Review the Coordinator's final synthesis."
+)
+_GUIDANCE_CONTINUE = (
+    "\n\nGuidance for next step:"
+    "\n- **Revision/Branching:** Look for 'RECOMMENDATION: Revise thought #X...' or 'SUGGESTION: Consider branching...' in the response."
+    " Use `isRevision=True`/`revisesThought=X` for revisions or `branchFromThought=Y`/`branchId='...'` for branching accordingly."
+    "\n- **Next Thought:** Based on the Coordinator's response, formulate the next logical thought, addressing any points raised."
+)
+
+
+# --- MCP Handlers ---
+
+
+@mcp.prompt("sequential-thinking")
+def sequential_thinking_prompt(problem: str, context: str = ""):
+    """
+    Starter prompt for sequential thinking that ENCOURAGES non-linear exploration
+    using coordinate mode. Returns separate user and assistant messages.
+    """
+    values = {"problem": problem, "context": context, "min_thoughts": _MIN_THOUGHTS}
+    user_prompt_text = _USER_PROMPT_TMPL[bool(context)].format_map(values)
+    assistant_guidelines = _ASSISTANT_GUIDELINES_TMPL.format_map(values)
+
     return [
         {
             "description": "Starter prompt for non-linear sequential thinking (coordinate mode), providing problem and guidelines separately.",
@@ -192,25 +248,29 @@ async def sequentialthinking(
              based on the specialists' analysis). The caller uses this response to formulate the *next* thought.
     """
     global app_context
-
-    # Initialize application context if not already initialized
-    if not app_context:
-        settings.logger_team.info(
-            "Initializing application resources directly (Coordinate Mode)..."
-        )
-        try:
-            team = create_sequential_thinking_team()
-            app_context = AppContext(team=team)
-            provider = settings.LLM_PROVIDER
-            settings.logger_team.info(
-                f"Pydantic team initialized directly in coordinate mode using provider: {provider}."
-            )
-        except Exception as e:
-            settings.logger_team.critical(
-                f"Failed to initialize Pydantic team during tool call: {e}",
-                exc_info=True,
-            )
-            return f"Critical Error: Application context not available and re-initialization failed: {e}"
+    logger = settings.logger_team
+
+    # Initialize application context if not already initialized. The lock makes
+    # concurrent first calls wait for a single team creation.
+    if app_context is None:
+        async with _app_context_lock:
+            if app_context is None:
+                logger.info(
+                    "Initializing application resources directly (Coordinate Mode)..."
+                )
+                try:
+                    team = await asyncio.to_thread(create_sequential_thinking_team)
+                    app_context = AppContext(team=team)
+                    provider = settings.LLM_PROVIDER
+                    logger.info(
+                        f"Pydantic team initialized directly in coordinate mode using provider: {provider}."
+                    )
+                except Exception as e:
+                    logger.critical(
+                        f"Failed to initialize Pydantic team during tool call: {e}",
+                        exc_info=True,
+                    )
+                    return f"Critical Error: Application context not available and re-initialization failed: {e}"
 
     try:
         # --- Initial Validation and Adjustments ---
@@ -238,20 +298,21 @@ async def sequentialthinking(
             adjusted_next_thought_needed = False
 
         # --- Logging and History Update ---
-        log_prefix = "--- Received Thought ---"
-        if current_input_thought.isRevision:
-            log_prefix = f"--- Received REVISION Thought (revising #{current_input_thought.revisesThought}) ---"
-        elif current_input_thought.branchFromThought is not None:
-            log_prefix = f"--- Received BRANCH Thought (from #{current_input_thought.branchFromThought}, ID: {current_input_thought.branchId}) ---"
+        if logger.isEnabledFor(logging.INFO):
+            log_prefix = "--- Received Thought ---"
+            if current_input_thought.isRevision:
+                log_prefix = f"--- Received REVISION Thought (revising #{current_input_thought.revisesThought}) ---"
+            elif current_input_thought.branchFromThought is not None:
+                log_prefix = f"--- Received BRANCH Thought (from #{current_input_thought.branchFromThought}, ID: {current_input_thought.branchId}) ---"
 
-        formatted_log_thought = format_thought_for_log(current_input_thought)
-        settings.logger_team.info(f"\n{log_prefix}\n{formatted_log_thought}\n")
+            formatted_log_thought = format_thought_for_log(current_input_thought)
+            logger.info(f"\n{log_prefix}\n{formatted_log_thought}\n")
 
         # Add the *validated* thought to history
         app_context.add_thought(current_input_thought)
 
         # --- Process Thought with Team (Coordinate Mode) ---
-        settings.logger_team.info(
+        logger.info(
             f"Passing thought #{current_input_thought.thoughtNumber} to the Coordinator..."
         )
 
@@ -261,25 +322,28 @@ async def sequentialthinking(
             and current_input_thought.revisesThought is not None
         ):
             # Find the original thought text
-            original_thought_text = "Unknown Original Thought"
-            for hist_thought in app_context.thought_history[:-1]:  # Exclude current one
-                if hist_thought.thoughtNumber == current_input_thought.revisesThought:
-                    original_thought_text = hist_thought.thought
-                    break
+            original_thought = app_context.get_thought(
+                current_input_thought.revisesThought
+            )
+            original_thought_text = (
+                original_thought.thought
+                if original_thought is not None
+                else "Unknown Original Thought"
+            )
             input_prompt += f'**This is a REVISION of Thought #{current_input_thought.revisesThought}** (Original: "{original_thought_text}").\n'
         elif (
             current_input_thought.branchFromThought is not None
             and current_input_thought.branchId is not None
         ):
             # Find the branching point thought text
-            branch_point_text = "Unknown Branch Point"
-            for hist_thought in app_context.thought_history[:-1]:
-                if (
-                    hist_thought.thoughtNumber
-                    == current_input_thought.branchFromThought
-                ):
-                    branch_point_text = hist_thought.thought
-                    break
+            branch_point = app_context.get_thought(
+                current_input_thought.branchFromThought
+            )
+            branch_point_text = (
+                branch_point.thought
+                if branch_point is not None
+                else "Unknown Branch Point"
+            )
             input_prompt += f'**This is a BRANCH (ID: {current_input_thought.branchId}) from Thought #{current_input_thought.branchFromThought}** (Origin: "{branch_point_text}").\n'
 
         input_prompt += f'\nThought Content: "{current_input_thought.thought}"'
@@ -292,65 +356,44 @@ async def sequentialthinking(
             raise
 
         # Ensure coordinator_response is a string, default to empty string if None
-        coordinator_response_content = (
-            team_response.content if hasattr(team_response, "content") else None
-        )
-        coordinator_response = (
-            str(coordinator_response_content)
-            if coordinator_response_content is not None
-            else ""
-        )
+        content = getattr(team_response, "content", None)
+        if content is None:
+            coordinator_response = ""
+        elif isinstance(content, str):
+            coordinator_response = content
+        else:
+            coordinator_response = str(content)
 
-        settings.logger_team.info(
+        logger.info(
             f"Coordinator finished processing thought #{current_input_thought.thoughtNumber}."
         )
-        settings.logger_team.debug(f"Coordinator Raw Response:\n{coordinator_response}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Coordinator Raw Response:\n{coordinator_response}")
 
         # --- Guidance for Next Step (Coordinate Mode) ---
-        additional_guidance = "\n\nGuidance for next step:"  # Initialize
-
-        if not adjusted_next_thought_needed:
-            additional_guidance = "\n\nThis is the final thought. Review the Coordinator's final synthesis."
-        else:
-            additional_guidance += "\n- **Revision/Branching:** Look for 'RECOMMENDATION: Revise thought #X...' or 'SUGGESTION: Consider branching...' in the response."
-            additional_guidance += " Use `isRevision=True`/`revisesThought=X` for revisions or `branchFromThought=Y`/`branchId='...'` for branching accordingly."
-            additional_guidance += "\n- **Next Thought:** Based on the Coordinator's response, formulate the next logical thought, addressing any points raised."
+        additional_guidance = (
+            _GUIDANCE_CONTINUE if adjusted_next_thought_needed else _GUIDANCE_FINAL
+        )
 
         # --- Build Result ---
-        result_data = {
-            "processedThoughtNumber": current_input_thought.thoughtNumber,
-            "estimatedTotalThoughts": current_input_thought.totalThoughts,
-            "nextThoughtNeeded": adjusted_next_thought_needed,
-            "coordinatorResponse": coordinator_response + str(additional_guidance),
-            "branches": list(app_context.branches.keys()),
-            "thoughtHistoryLength": len(app_context.thought_history),
-            "branchDetails": {
-                "currentBranchId": (
-                    current_input_thought.branchId
-                    if current_input_thought.branchFromThought is not None
-                    else "main"
-                ),
-                "branchOriginThought": current_input_thought.branchFromThought,
-                "allBranches": app_context.get_all_branches(),
-            },
-            "isRevision": current_input_thought.isRevision,
-            "revisesThought": (
-                current_input_thought.revisesThought
-                if current_input_thought.isRevision
-                else None
-            ),
-            "isBranch": current_input_thought.branchFromThought is not None,
-            "status": "success",
-        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Processed thought #%s (estimated total: %s, next needed: %s, history length: %s, branches: %s)",
+                current_input_thought.thoughtNumber,
+                current_input_thought.totalThoughts,
+                adjusted_next_thought_needed,
+                len(app_context.thought_history),
+                app_context.get_all_branches(),
+            )
 
-        # Return only the coordinatorResponse as a string
-        return result_data["coordinatorResponse"]
+        # Return only the coordinator response and the guidance as a string
+        return coordinator_response + additional_guidance
 
     except ValidationError as e:
-        settings.logger_team.error(f"Validation Error processing tool call: {e}")
+        logger.error(f"Validation Error processing tool call: {e}")
         return f"Input validation failed: {e}"
     except Exception as e:
-        settings.logger_team.exception("Error processing tool call")
+        logger.exception("Error processing tool call")
         return f"An unexpected error occurred: {str(e)}"
 
 
@@ -369,7 +412,7 @@ async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
         "Initializing application resources (Coordinate Mode)..."
     )
     try:
-        team = create_sequential_thinking_team()
+        team = await asyncio.to_thread(create_sequential_thinking_team)
         app_context = AppContext(team=team)
         provider = settings.LLM_PROVIDER
         settings.logger_fastapi.info(
@@ -391,6 +434,7 @@ async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
     finally:
         settings.logger_fastapi.info("Shutting down application resources...")
         app_context = None
+        shutdown_logging()
 
 
 app = FastAPI(
@@ -401,18 +445,14 @@ app = FastAPI(
     openapi_url="/mcp/openapi.json",
 )
 
-# Add CORS middleware to the main FastAPI app
+# Add CORS middleware to the main FastAPI app.
+# This automatically handles OPTIONS for all routes, including /mcp.
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],  # Configure appropriately for production
-    allow_methods=["GET", "POST", "DELETE"],  # MCP streamable HTTP methods
-    allow_headers=[
-        "mcp-protocol-version",
-        "mcp-session-id",
-        "Authorization",
-        "Content-Type",
-    ],
+    allow_methods=["*"],
+    allow_headers=["*"],
     expose_headers=["Mcp-Session-Id"],  # Critical for session handling
 )
 
@@ -420,66 +460,74 @@ app.add_middleware(
 # Mount the FastMCP app to the FastAPI app
 app.mount("/mcp-server", mcp_app, "mcp")
 
-# This automatically handles OPTIONS for all routes, including /mcp.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+# Only these methods carry a JSON body worth logging
+_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+# Probe endpoints are not worth a request log, they are hit every few seconds
+_SKIP_LOG_PATHS = frozenset({"/", "/health-check"})
+
+# Request ids are "<boot id>-<hex counter>": unique for the process lifetime
+_BOOT_ID = secrets.token_hex(4)
+_req_counter = itertools.count()
 
 
 # add a log middleware
 @app.middleware("http")
 async def log_middleware(request: Request, call_next):
-    req_id = str(uuid.uuid4())
+    if request.method == "OPTIONS" or request.url.path in _SKIP_LOG_PATHS:
+        return await call_next(request)
+
+    req_id = f"{_BOOT_ID}-{next(_req_counter):x}"
     try:
         #### request ####
         request.state.req_id = req_id
-        request.state.body = json.loads(await request.body() or "{}")
+        request.state.body = {}
+        if request.method in _BODY_METHODS and request.headers.get(
+            "content-type", ""
+        ).startswith("application/json"):
+            # Starlette caches the bytes, the endpoint does not read them again
+            body = await request.body()
+            if (
+                0 < settings.LOG_BODY_MAX_BYTES < len(body)
+                or request.url.path in settings.LOG_BODY_SKIP_PATHS
+            ):
+                # Not parsed nor logged, only its size
+                request.state.body = {"_truncated": True, "size": len(body)}
+            else:
+                request.state.body = json_loads(body or b"{}")
         log_request(request)
 
         #### response ####
-        response = await call_next(request)
-        response_body = []
-        if response.headers.get("content-type") == "application/json":
-            response_body = [chunk async for chunk in response.body_iterator]
-            response.body_iterator = iterate_in_threadpool(iter(response_body))
-        return response
+        # The body is streamed through untouched, it is never logged
+        return await call_next(request)
     except Exception:
         # Unexpected error handling
         settings.logger_fastapi.error(req_id, {"error_message": "ERR_UNEXPECTED"})
         raise HTTPException(status_code=500, detail="ERR_UNEXPECTED")
 
 
-# Add response on OPTIONS for openapi_url, workaround for support openwebui
-@app.options("/mcp-server/openapi.json")
-# @log_cancellation
-async def options_openapi(request: Request):
-    # Customize the response for the OPTIONS method
-    response = {
-        "method": "OPTIONS",
-        "allowed_methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
-        "description": "Custom OPTIONS response for /openapi.json",
+# Define FastAPI routes
+# Their responses never change, so they are serialized once at import.
+_ROOT_RESPONSE = json_dumps(
+    {
+        "service": "Highfeature Sequential Thinking MCP Service",
+        "version": "1.0.0",
+        "status": "running",
     }
-    return JSONResponse(content=response)
+)
+_HEALTH_CHECK_RESPONSE = json_dumps({"status": "healthy"})
 
 
-# Define FastAPI routes
 @app.get("/")
 # @log_cancellation
-async def root() -> dict[str, str]:
+async def root() -> Response:
     """Root endpoint showing service information."""
-    return {
-        "service": "Highfeature Sequential Thinking MCP Service",
-        "version": "1.0.0",
-        "status": "running",
-    }
+    return Response(content=_ROOT_RESPONSE, media_type="application/json")
 
 
 @app.get("/health-check")
 # @log_cancellation
-async def health_check() -> dict[str, str]:
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_CHECK_RESPONSE, media_type="application/json")
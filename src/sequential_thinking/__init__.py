@@ -1,15 +1,9 @@
-# from .team import create_sequential_thinking_team, get_model_config, Team
-# # from .main import app_context, AppContext, app_lifespan, mcp, sequentialthinking, sequential_thinking_prompt
-# from .main import app_context, AppContext, mcp, sequentialthinking, sequential_thinking_prompt
+from .models import ThoughtData
+from .team import create_sequential_thinking_team, get_model_config, Team
 
-# __all__ = [
-#     'create_sequential_thinking_team',
-#     'get_model_config',
-#     'Team',
-#     'app_context',
-#     'AppContext',
-#     # 'app_lifespan',
-#     'mcp',
-#     'sequentialthinking',
-#     'sequential_thinking_prompt'
-# ]
+__all__ = [
+    "create_sequential_thinking_team",
+    "get_model_config",
+    "Team",
+    "ThoughtData",
+]
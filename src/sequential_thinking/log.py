@@ -1,101 +1,242 @@
+import atexit
 import logging
 import logging.handlers
 import logging.config
+import queue
+import threading
 import traceback
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from pydantic import BaseModel
 from starlette.requests import Request
 
 from src.sequential_thinking.log_config import LOGGING_CONFIG
 from src.sequential_thinking.models import ThoughtData
+from src.sequential_thinking.serialization import json_dumps
 from src.sequential_thinking.settings import settings
 
+# Same object as settings.logger_fastapi once logging is set up, bound once
+# at import rather than looked up through settings on every request
+_fastapi_logger = logging.getLogger("fastapi")
+
 
 def log_request(request: Request):
-    request_info = RequestInfo(request)
-    request_log = RequestLog(
-        req_id=request.state.req_id,
-        method=request_info.method,
-        route=request_info.route,
-        ip=request_info.ip,
-        url=request_info.url,
-        host=request_info.host,
-        body=request_info.body,
-        headers=request_info.headers,
-    )
-    settings.logger_fastapi.info(request_log.model_dump())
+    if not _fastapi_logger.isEnabledFor(logging.INFO):
+        return
+    url = request.url
+    request_log = {
+        "req_id": request.state.req_id,
+        "method": request.method,
+        "route": request.scope["path"],
+        "ip": request.client.host,
+        "url": str(url),
+        "host": url.hostname,
+        "body": request.state.body,
+        "headers": dict(request.headers),
+    }
+    # Serialized once here instead of repr() of the dict by the formatter
+    _fastapi_logger.info(json_dumps(request_log).decode())
 
 
 def log_error(uuid: str, response_body: dict):
+    if not _fastapi_logger.isEnabledFor(logging.ERROR):
+        # Don't walk the traceback frames for nothing
+        return
     error_log = ErrorLog(
         req_id=uuid,
         error_message=response_body["error_message"],
     )
-    settings.logger_fastapi.error(error_log.model_dump())
-    settings.logger_fastapi.error(traceback.format_exc())
+    _fastapi_logger.error(error_log.model_dump_json())
+    _fastapi_logger.error(traceback.format_exc())
 
 
-class RequestInfo:
-    def __init__(self, request) -> None:
-        self.request = request
+class ErrorLog(BaseModel):
+    req_id: str
+    error_message: str
 
-    @property
-    def method(self) -> str:
-        return str(self.request.method)
 
-    @property
-    def route(self) -> str:
-        return self.request["path"]
+# Number of records buffered in memory before they are written to a log file
+LOG_BUFFER_CAPACITY = 512
+# Seconds between two forced flushes of the buffers, caps the delay of a record
+LOG_FLUSH_INTERVAL = 0.2
 
-    @property
-    def ip(self) -> str:
-        return str(self.request.client.host)
+# Single queue shared by every configured logger, drained by one listener thread
+_log_queue: queue.Queue = queue.Queue(-1)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+# The listener's handler, kept to attach its routes back on shutdown
+_routing_handler: Optional["_RoutingHandler"] = None
+_flush_stop = threading.Event()
+_flush_thread: Optional[threading.Thread] = None
 
-    @property
-    def url(self) -> str:
-        return str(self.request.url)
 
-    @property
-    def host(self) -> str:
-        return str(self.request.url.hostname)
+class _RoutingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler tagging each record with the logger it was attached to."""
 
-    @property
-    def headers(self) -> dict:
-        return {key: value for key, value in self.request.headers.items()}
+    def __init__(self, log_queue: queue.Queue, route: str):
+        super().__init__(log_queue)
+        self.route = route
 
-    @property
-    def body(self) -> dict:
-        return self.request.state.body
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.log_route = self.route
+        return record
 
 
-class RequestLog(BaseModel):
-    req_id: str
-    method: str
-    route: str
-    ip: str
-    url: str
-    host: str
-    body: dict
-    headers: dict
+class _RoutingHandler(logging.Handler):
+    """Dispatches a dequeued record to the handlers of the logger it came from."""
 
+    def __init__(self, routes: Dict[str, Tuple[logging.Handler, ...]]):
+        super().__init__()
+        self.routes = routes
 
-class ErrorLog(BaseModel):
-    req_id: str
-    error_message: str
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.routes.get(getattr(record, "log_route", None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
 
 
 def setup_logging():
     """
     Set up application logging with both file and console handlers.
+
+    The handlers configured on each logger are moved behind a QueueHandler, so
+    the caller (usually the event loop) only enqueues the record while a single
+    QueueListener thread does the actual file and console writes for all of
+    them. File handlers are additionally wrapped in a MemoryHandler so records
+    are written in batches.
     """
+    global _queue_listener, _routing_handler
+    if _queue_listener is not None:
+        # Already set up (e.g. on a reload): configuring again would start a
+        # second listener writing every record twice.
+        return
+
+    Path(settings.LOG_FOLDER).mkdir(parents=True, exist_ok=True)
     logging.config.dictConfig(LOGGING_CONFIG)
 
-    settings.logger_fastapi = logging.getLogger("fastapi")
-    settings.logger_team = logging.getLogger("team")
+    buffered_handlers: Dict[logging.Handler, logging.handlers.MemoryHandler] = {}
+    routes: Dict[str, Tuple[logging.Handler, ...]] = {}
+    for logger_name in LOGGING_CONFIG["loggers"]:
+        logger = logging.getLogger(logger_name)
+        handlers = tuple(logger.handlers)
+        if not handlers:
+            continue
+        routes[logger_name] = tuple(
+            _buffer_handler(handler, buffered_handlers) for handler in handlers
+        )
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(_RoutingQueueHandler(_log_queue, logger_name))
+
+    _routing_handler = _RoutingHandler(routes)
+    _queue_listener = logging.handlers.QueueListener(_log_queue, _routing_handler)
+    _queue_listener.start()
+    _start_flush_thread(tuple(buffered_handlers.values()))
+    # Lifespan shutdown is not run on every exit path, don't lose the buffers then
+    atexit.register(shutdown_logging)
+
+    settings.loggers.fastapi = logging.getLogger("fastapi")
+    settings.loggers.team = logging.getLogger("team")
+
+
+def _buffer_handler(
+    handler: logging.Handler,
+    buffered_handlers: Dict[logging.Handler, logging.handlers.MemoryHandler],
+) -> logging.Handler:
+    """Wraps a file handler in a MemoryHandler, shared by every logger using it."""
+    if not isinstance(handler, logging.FileHandler):
+        return handler
+    if handler not in buffered_handlers:
+        buffered = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=handler,
+            flushOnClose=True,
+        )
+        # MemoryHandler.flush() bypasses the target level, so filter on the way in
+        buffered.setLevel(handler.level)
+        buffered_handlers[handler] = buffered
+    return buffered_handlers[handler]
+
+
+def _flush_periodically(handlers: Tuple[logging.handlers.MemoryHandler, ...]):
+    while not _flush_stop.wait(LOG_FLUSH_INTERVAL):
+        for handler in handlers:
+            handler.flush()
+
+
+def _start_flush_thread(handlers: Tuple[logging.handlers.MemoryHandler, ...]):
+    """Starts a daemon thread flushing the buffered handlers every LOG_FLUSH_INTERVAL."""
+    global _flush_thread
+    if not handlers:
+        return
+    _flush_stop.clear()
+    _flush_thread = threading.Thread(
+        target=_flush_periodically,
+        args=(handlers,),
+        name="log-flush",
+        daemon=True,
+    )
+    _flush_thread.start()
+
+
+def _stop_flush_thread():
+    global _flush_thread
+    if _flush_thread is None:
+        return
+    _flush_stop.set()
+    _flush_thread.join()
+    _flush_thread = None
+
+
+def shutdown_logging():
+    """
+    Stop the queue listener, flushing the pending records to their handlers.
+
+    The original (unbuffered) handlers are attached back to their loggers, so
+    anything logged after the shutdown is still written (synchronously).
+    """
+    global _queue_listener, _routing_handler
+    if _queue_listener is None or _routing_handler is None:
+        return
+    listener, _queue_listener = _queue_listener, None
+    router, _routing_handler = _routing_handler, None
+    listener.stop()
+    _stop_flush_thread()
+    atexit.unregister(shutdown_logging)
+
+    for logger_name, handlers in router.routes.items():
+        logger = logging.getLogger(logger_name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, _RoutingQueueHandler):
+                logger.removeHandler(handler)
+        for handler in handlers:
+            if isinstance(handler, logging.handlers.MemoryHandler):
+                handler.flush()
+                handler = handler.target
+            logger.addHandler(handler)
 
 
 # --- Utility for Formatting Thoughts (for Logging) ---
+# Templates filled with the ThoughtData fields by format_thought_for_log
+_STATUS_FMT = "  Next Needed: {nextThoughtNeeded}, Needs More: {needsMoreThoughts}"
+_REV_FMT = (
+    "Revision {thoughtNumber}/{totalThoughts} (revising thought {revisesThought})\n"
+    "  Thought: {thought}\n" + _STATUS_FMT
+)
+_BRANCH_FMT = (
+    "Branch {thoughtNumber}/{totalThoughts} (from thought {branchFromThought}, ID: {branchId})\n"
+    "  Thought: {thought}\n"
+    "  Branch Details: ID='{branchId}', originates from Thought #{branchFromThought}\n"
+    + _STATUS_FMT
+)
+_STD_FMT = (
+    "Thought {thoughtNumber}/{totalThoughts}\n  Thought: {thought}\n" + _STATUS_FMT
+)
+
+
 def format_thought_for_log(thought_data: ThoughtData) -> str:
     """Formats a ThoughtData object into a human-readable string for logging.
 
@@ -121,39 +262,13 @@ def format_thought_for_log(thought_data: ThoughtData) -> str:
           Thought: Initial plan for the analysis.
           Next Needed: True, Needs More: False
     """
-    prefix: str
-    context: str = ""
-    branch_info_log: Optional[str] = None  # Optional line for branch-specific details
-
-    # Determine the type of thought and associated context
+    # Pick the template matching the type of thought (standard, revision or branch)
     if thought_data.isRevision and thought_data.revisesThought is not None:
-        prefix = "Revision"
-        context = f" (revising thought {thought_data.revisesThought})"
+        template = _REV_FMT
     elif (
         thought_data.branchFromThought is not None and thought_data.branchId is not None
     ):
-        prefix = "Branch"
-        context = f" (from thought {thought_data.branchFromThought}, ID: {thought_data.branchId})"
-        # Prepare the extra detail line for branches
-        branch_info_log = f"  Branch Details: ID='{thought_data.branchId}', originates from Thought #{thought_data.branchFromThought}"
+        template = _BRANCH_FMT
     else:
-        # Standard thought
-        prefix = "Thought"
-        # No extra context needed for standard thoughts
-
-    # Construct the header line (e.g., "Thought 1/5", "Revision 3/5 (revising thought 2)")
-    header = (
-        f"{prefix} {thought_data.thoughtNumber}/{thought_data.totalThoughts}{context}"
-    )
-
-    # Assemble the log entry lines
-    log_lines = [header, f"  Thought: {thought_data.thought}"]  # Indent thought content
-    if branch_info_log:
-        log_lines.append(branch_info_log)  # Add branch details if applicable
-
-    # Add status flags line
-    log_lines.append(
-        f"  Next Needed: {thought_data.nextThoughtNeeded}, Needs More: {thought_data.needsMoreThoughts}"
-    )
-
-    return "\n".join(log_lines)
+        template = _STD_FMT
+    return template.format_map(thought_data.__dict__)
@@ -37,8 +37,10 @@ LOGGING_CONFIG = {
             "level": "DEBUG" if settings.DEBUG else "INFO",
             "filename": f"{settings.LOG_FOLDER}/sequential_thinking.log",
             "mode": "a",
-            'maxBytes': 10485760,  # 10 MB
+            'maxBytes': 67108864,  # 64 MB
             'backupCount': 5,
+            # opened on the first record instead of at configuration
+            'delay': True,
         },
         "file_access": {
             "formatter": "formatter_simple",
@@ -46,8 +48,10 @@ LOGGING_CONFIG = {
             "level": "DEBUG" if settings.DEBUG else "INFO",
             "filename": f"{settings.LOG_FOLDER}/sequential_thinking_access.log",
             "mode": "a",
-            'maxBytes': 10485760,  # 10 MB
+            'maxBytes': 67108864,  # 64 MB
             'backupCount': 5,
+            # opened on the first record instead of at configuration
+            'delay': True,
         },
         "file_errors": {
             "formatter": "formatter_detailed",
@@ -55,8 +59,10 @@ LOGGING_CONFIG = {
             "level": "DEBUG" if settings.DEBUG else "INFO",
             "filename": f"{settings.LOG_FOLDER}/sequential_thinking_errors.log",
             "mode": "a",
-            'maxBytes': 10485760,  # 10 MB
+            'maxBytes': 67108864,  # 64 MB
             'backupCount': 5,
+            # opened on the first record instead of at configuration
+            'delay': True,
         },
     },
     "loggers": {
@@ -96,7 +102,7 @@ LOGGING_CONFIG = {
                 # "console"
             ],
             "level": "INFO",
-            "propagate": True,
+            "propagate": False,
         },
         # "FastMCP.fastmcp.server.server": {
         #     "handlers": [
@@ -132,7 +138,7 @@ LOGGING_CONFIG = {
         # },
         "team": {
             "handlers": ["file_sequential_thinking", "console"],
-            "level": "DEBUG",
+            "level": "DEBUG" if settings.DEBUG else "INFO",
             "propagate": False,
         },
     },
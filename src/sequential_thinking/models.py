@@ -1,10 +1,11 @@
+import logging
+
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
     field_validator,
     model_validator,
-    ValidationInfo,
 )
 from typing import Optional, ClassVar
 
@@ -57,10 +58,8 @@ class ThoughtData(BaseModel):
 
     # Pydantic model configuration
     model_config = ConfigDict(
-        validate_assignment=True,
         extra="forbid",
-        frozen=True,  # Immutable; consider mutability if in-tool modification is needed.
-        arbitrary_types_allowed=True,
+        frozen=True,  # Immutable (and hashable); consider mutability if in-tool modification is needed.
         json_schema_extra={
             "examples": [
                 {
@@ -99,47 +98,33 @@ class ThoughtData(BaseModel):
     def validate_total_thoughts_minimum(cls, v: int) -> int:
         """Ensures 'totalThoughts' meets the defined minimum requirement."""
         if v < cls.MIN_TOTAL_THOUGHTS:
-            settings.logger_team.info(
-                f"Input totalThoughts ({v}) is below suggested minimum {cls.MIN_TOTAL_THOUGHTS}. "
-                f"Adjusting to {cls.MIN_TOTAL_THOUGHTS}."
-            )
+            logger = settings.logger_team
+            # The logger is only set once logging is set up
+            if logger is not None and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Input totalThoughts (%d) is below suggested minimum %d. "
+                    "Adjusting to %d.",
+                    v,
+                    cls.MIN_TOTAL_THOUGHTS,
+                    cls.MIN_TOTAL_THOUGHTS,
+                )
             return cls.MIN_TOTAL_THOUGHTS
         return v
 
-    @field_validator("revisesThought")
-    @classmethod
-    def validate_revises_thought(
-        cls, v: Optional[int], info: ValidationInfo
-    ) -> Optional[int]:
-        """Validates 'revisesThought' logic."""
-        is_revision = info.data.get("isRevision", False)
-        if v is not None and not is_revision:
-            raise ValueError("revisesThought can only be set when isRevision is True")
-        # Ensure the revised thought number is valid and precedes the current thought
-        if (
-            v is not None
-            and "thoughtNumber" in info.data
-            and v >= info.data["thoughtNumber"]
-        ):
-            raise ValueError("revisesThought must be less than thoughtNumber")
-        return v
-
-    @field_validator("branchId")
-    @classmethod
-    def validate_branch_id(
-        cls, v: Optional[str], info: ValidationInfo
-    ) -> Optional[str]:
-        """Validates 'branchId' logic."""
-        branch_from_thought = info.data.get("branchFromThought")
-        if v is not None and branch_from_thought is None:
-            raise ValueError("branchId can only be set when branchFromThought is set")
-        return v
-
     @model_validator(mode="after")
     def validate_thought_numbers(self) -> "ThoughtData":
-        """Performs model-level validation on thought numbering."""
+        """Performs model-level validation on thought numbering, revisions and branches."""
         # Allow thoughtNumber > totalThoughts for dynamic adjustment downstream.
-        # revisesThought validation is handled by its field_validator.
+        if self.revisesThought is not None:
+            if not self.isRevision:
+                raise ValueError(
+                    "revisesThought can only be set when isRevision is True"
+                )
+            # Ensure the revised thought number precedes the current thought
+            if self.revisesThought >= self.thoughtNumber:
+                raise ValueError("revisesThought must be less than thoughtNumber")
+        if self.branchId is not None and self.branchFromThought is None:
+            raise ValueError("branchId can only be set when branchFromThought is set")
         if (
             self.branchFromThought is not None
             and self.branchFromThought >= self.thoughtNumber
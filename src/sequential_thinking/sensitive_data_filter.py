@@ -1,5 +1,8 @@
 import logging
 import re
+from collections import deque
+
+from src.sequential_thinking.settings import settings
 
 
 class SensitiveDataFilter(logging.Filter):
@@ -12,33 +15,76 @@ class SensitiveDataFilter(logging.Filter):
         "access_token",
     )
     TOKEN_PATTERN = r"token=([^;]+)"
+    _SENSITIVE = frozenset(key.lower() for key in SENSITIVE_KEYS)
+    _TOKEN_RE = re.compile(TOKEN_PATTERN)
 
     def filter(self, record):
         try:
-            record.args = self.mask_sensitive_args(record.args)
+            # The message first: records coming through the logging queue are
+            # already merged (QueueHandler.prepare() sets args to None)
             record.msg = self.mask_sensitive_msg(record.msg)
+            if record.args:
+                record.args = self.mask_sensitive_args(record.args)
             return True
         except Exception:
             return True
 
     def mask_sensitive_args(self, args):
+        if not args:
+            # None (merged by a QueueHandler) or no args at all
+            return args
         if isinstance(args, dict):
-            new_args = args.copy()
-            for key in args.keys():
-                if key.lower() in self.SENSITIVE_KEYS:
-                    new_args[key] = "******"
-                else:
-                    # mask sensitive data in dict values
-                    new_args[key] = self.mask_sensitive_msg(args[key])
-            return new_args
+            return self.mask_sensitive_dict(args)
         # when there are multi arg in record.args
         return tuple([self.mask_sensitive_msg(arg) for arg in args])
 
     def mask_sensitive_msg(self, message):
         # mask sensitive data in multi record.args
         if isinstance(message, dict):
-            return self.mask_sensitive_args(message)
+            return self.mask_sensitive_dict(message)
         if isinstance(message, str):
-            replace = "token=******"
-            message = re.sub(self.TOKEN_PATTERN, replace, message)
+            return self.mask_token(message)
         return message
+
+    def mask_token(self, message: str) -> str:
+        if "token=" not in message:
+            return message
+        if 0 < settings.LOG_MASK_MAX_LENGTH < len(message):
+            # too long to be worth scanning, see LOG_MASK_MAX_LENGTH
+            return message
+        return self._TOKEN_RE.sub("token=******", message)
+
+    def mask_sensitive_dict(self, args: dict) -> dict:
+        # Walked with an explicit stack rather than recursion, each entry is a
+        # dict of the caller and the keys leading to it. Nothing is copied until
+        # a value is masked, then only the dicts on the way to it are.
+        masked_args = None
+        copies = set()  # ids of the dicts copied so far
+        stack = deque([(args, ())])
+        while stack:
+            current, path = stack.pop()
+            for key, value in current.items():
+                if isinstance(key, str) and key.lower() in self._SENSITIVE:
+                    masked = "******"
+                elif isinstance(value, dict):
+                    stack.append((value, path + (key,)))
+                    continue
+                elif isinstance(value, str):
+                    masked = self.mask_token(value)
+                    if masked is value:
+                        continue
+                else:
+                    continue
+
+                if masked_args is None:
+                    masked_args = args.copy()
+                    copies.add(id(masked_args))
+                target = masked_args
+                for step in path:
+                    child = target[step]
+                    if id(child) not in copies:
+                        child = target[step] = child.copy()
+                        copies.add(id(child))
+                    target = child
+                target[key] = masked
+        return args if masked_args is None else masked_args
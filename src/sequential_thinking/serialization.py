@@ -0,0 +1,14 @@
+# orjson is noticeably faster than the standard library on request payloads,
+# but it is optional: fall back to json when it is not installed.
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # pragma: no cover
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        """Serializes to compact JSON bytes, like orjson.dumps."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+__all__ = ["json_dumps", "json_loads"]
@@ -1,35 +1,78 @@
+import logging
 import os
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Optional
 
 
+def _env(name: str, default: str, convert: Callable = str):
+    """Field read from the environment variable `name` when Settings is built."""
+    return field(default_factory=lambda: convert(os.environ.get(name, default)))
+
+
+def _is_true(value: str) -> bool:
+    return value == "True"
+
+
+def _paths(value: str) -> FrozenSet[str]:
+    return frozenset(path for path in value.split(",") if path)
+
+
+class LoggerRegistry:
+    """Loggers set up by setup_logging(), None until then."""
+
+    __slots__ = ("fastapi", "team")
+
+    def __init__(self) -> None:
+        self.fastapi: Optional[logging.Logger] = None
+        self.team: Optional[logging.Logger] = None
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    PORT = int(os.getenv("PORT", 8090))
-    logger_fastapi = None
-    logger_team = None
-    DEBUG = True if os.environ.get("DEBUG", "False") == "True" else False
-    DEBUG_AGENTS = True if os.environ.get("DEBUG_AGENTS", "False") == "True" else False
-    LOG_FOLDER = os.environ.get("LOG_FOLDER", "logs")
-    WEB_SEARCH_TOOL = os.environ.get("WEB_SEARCH_TOOL", "DuckDuckGoTools")
+    PORT: int = _env("PORT", "8090", int)
+    DEBUG: bool = _env("DEBUG", "False", _is_true)
+    DEBUG_AGENTS: bool = _env("DEBUG_AGENTS", "False", _is_true)
+    LOG_FOLDER: str = _env("LOG_FOLDER", "logs")
+    # longest console message scanned for tokens, 0 for no limit
+    LOG_MASK_MAX_LENGTH: int = _env("LOG_MASK_MAX_LENGTH", "0", int)
+    # request bodies above this size are logged as their size only, 0 for no limit
+    LOG_BODY_MAX_BYTES: int = _env("LOG_BODY_MAX_BYTES", "4096", int)
+    # comma separated paths whose request bodies are never logged
+    LOG_BODY_SKIP_PATHS: FrozenSet[str] = _env("LOG_BODY_SKIP_PATHS", "", _paths)
+    WEB_SEARCH_TOOL: str = _env("WEB_SEARCH_TOOL", "DuckDuckGoTools")
+    # number of thoughts kept in memory, 0 for no limit
+    MAX_THOUGHT_HISTORY: int = _env("MAX_THOUGHT_HISTORY", "10000", int)
     # provider
-    LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "ollama").lower()
+    LLM_PROVIDER: str = _env("LLM_PROVIDER", "ollama", str.lower)
     # models
-    DEEPSEEK_TEAM_MODEL_ID = os.environ.get("DEEPSEEK_TEAM_MODEL_ID", "deepseek-chat")
-    DEEPSEEK_AGENT_MODEL_ID = os.environ.get("DEEPSEEK_AGENT_MODEL_ID", "deepseek-chat")
-    GROQ_TEAM_MODEL_ID = os.environ.get(
+    DEEPSEEK_TEAM_MODEL_ID: str = _env("DEEPSEEK_TEAM_MODEL_ID", "deepseek-chat")
+    DEEPSEEK_AGENT_MODEL_ID: str = _env("DEEPSEEK_AGENT_MODEL_ID", "deepseek-chat")
+    GROQ_TEAM_MODEL_ID: str = _env(
         "GROQ_TEAM_MODEL_ID", "deepseek-r1-distill-llama-70b"
     )
-    GROQ_AGENT_MODEL_ID = os.environ.get("GROQ_AGENT_MODEL_ID", "qwen-2.5-32b")
-    OPENROUTER_TEAM_MODEL_ID = os.environ.get(
+    GROQ_AGENT_MODEL_ID: str = _env("GROQ_AGENT_MODEL_ID", "qwen-2.5-32b")
+    OPENROUTER_TEAM_MODEL_ID: str = _env(
         "OPENROUTER_TEAM_MODEL_ID", "deepseek/deepseek-chat-v3-0324"
     )
-    OPENROUTER_AGENT_MODEL_ID = os.environ.get(
+    OPENROUTER_AGENT_MODEL_ID: str = _env(
         "OPENROUTER_AGENT_MODEL_ID", "deepseek/deepseek-r1"
     )
-    OLLAMA_TEAM_MODEL_ID = os.environ.get(
+    OLLAMA_TEAM_MODEL_ID: str = _env(
         "OLLAMA_TEAM_MODEL_ID", "hf-tool-thinking-qween3-14b-32k:latest"
     )
-    OLLAMA_AGENT_MODEL_ID = os.environ.get(
+    OLLAMA_AGENT_MODEL_ID: str = _env(
         "OLLAMA_AGENT_MODEL_ID", "hf-tool-thinking-qween3-14b-32k:latest"
     )
+    # the settings are frozen, the loggers are set later by setup_logging()
+    loggers: LoggerRegistry = field(default_factory=LoggerRegistry, repr=False)
+
+    @property
+    def logger_fastapi(self) -> Optional[logging.Logger]:
+        return self.loggers.fastapi
+
+    @property
+    def logger_team(self) -> Optional[logging.Logger]:
+        return self.loggers.team
 
 
 settings = Settings()
@@ -0,0 +1,37 @@
+import asyncio
+import sys
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastmcp.client import Client
+
+from src.main import app, mcp
+
+
+# Tests run on uvloop like the server (see the Dockerfile), where it is available
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    if sys.platform == "win32":
+        return asyncio.DefaultEventLoopPolicy()
+    import uvloop
+
+    return uvloop.EventLoopPolicy()
+
+
+# One in-memory client for the whole session: the server is started (and the
+# team built) once instead of once per test.
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    async with Client(mcp) as mcp_client:
+        yield mcp_client
+
+
+# One async HTTP client for the FastAPI routes, requests are sent straight to
+# the ASGI app without a portal thread per call like TestClient.
+@pytest_asyncio.fixture(scope="session")
+async def http():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        yield http_client
@@ -0,0 +1,89 @@
+import io
+import logging
+import time
+
+from src.main import app  # noqa: F401  (sets up logging)
+from src.sequential_thinking.sensitive_data_filter import SensitiveDataFilter
+from src.sequential_thinking.settings import settings
+
+
+def test_console_log_is_masked():
+    # The console handler configured by LOGGING_CONFIG, now fed by the queue
+    # listener thread set up by setup_logging()
+    console = logging._handlers["console"]
+    stream = io.StringIO()
+    previous = console.setStream(stream)
+    try:
+        settings.logger_team.info("auth token=SUPERSECRET; rest")
+        settings.logger_team.info("auth %s", "token=OTHERSECRET; rest")
+        # Wait for the listener thread to write both records
+        deadline = time.monotonic() + 2
+        while stream.getvalue().count("\n") < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        console.setStream(previous)
+
+    output = stream.getvalue()
+    assert "SUPERSECRET" not in output
+    assert "OTHERSECRET" not in output
+    assert output.count("auth token=******; rest") == 2
+
+
+def test_mask_sensitive_args_without_args():
+    data_filter = SensitiveDataFilter()
+    assert data_filter.mask_sensitive_args(None) is None
+    assert data_filter.mask_sensitive_args(()) == ()
+
+
+def test_mask_sensitive_key():
+    masked = SensitiveDataFilter().mask_sensitive_args(
+        {"Authorization": "Bearer abc", "user": "bob"}
+    )
+    assert masked == {"Authorization": "******", "user": "bob"}
+
+
+def test_mask_token_string():
+    data_filter = SensitiveDataFilter()
+    assert data_filter.mask_sensitive_args(("a token=abc; b", "plain")) == (
+        "a token=******; b",
+        "plain",
+    )
+    assert data_filter.mask_sensitive_msg("no secret here") == "no secret here"
+
+
+def test_mask_nested_dict_leaves_caller_dict_untouched():
+    args = {
+        "body": {"password": "hunter2", "query": {"url": "/x?token=abc"}},
+        "name": "bob",
+    }
+    masked = SensitiveDataFilter().mask_sensitive_args(args)
+
+    assert masked == {
+        "body": {"password": "******", "query": {"url": "/x?token=******"}},
+        "name": "bob",
+    }
+    assert args == {
+        "body": {"password": "hunter2", "query": {"url": "/x?token=abc"}},
+        "name": "bob",
+    }
+
+
+def test_mask_dict_without_secrets_is_not_copied():
+    args = {"name": "bob", "nested": {"count": 1}}
+    assert SensitiveDataFilter().mask_sensitive_args(args) is args
+
+
+def test_mask_dict_only_copies_the_masked_branch():
+    untouched = {"count": 1, "inner": {"name": "bob"}}
+    args = {"password": "hunter2", "untouched": untouched, "deep": {"x": {"token": 1}}}
+    masked = SensitiveDataFilter().mask_sensitive_args(args)
+
+    assert masked == {
+        "password": "******",
+        "untouched": {"count": 1, "inner": {"name": "bob"}},
+        "deep": {"x": {"token": "******"}},
+    }
+    # Dicts without anything to mask are shared with the caller, not copied
+    assert masked["untouched"] is untouched
+    assert masked["deep"] is not args["deep"]
+    assert args["deep"] == {"x": {"token": 1}}
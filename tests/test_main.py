@@ -1,30 +1,211 @@
-import pytest
+import json
+from collections import deque
 
-from fastmcp.client import Client
+import pytest
+from pydantic import ValidationError
 
-from src.main import mcp
+from src.main import AppContext
+from src.sequential_thinking.models import ThoughtData
+from src.sequential_thinking.team import clear_cache, create_sequential_thinking_team
 
 
 @pytest.mark.asyncio
-async def test_sequential_thinking_tool():
-    # Create a client that connects directly to the server instance
-    async with Client(mcp) as client:
-        # Test the sequentialthinking tool with a simple input
-        result = await client.call_tool(
-            "sequentialthinking",
-            {
-                "thought": "Analyze the core assumptions of the problem.",
-                "thoughtNumber": 1,
-                "totalThoughts": 5,
-                "nextThoughtNeeded": True,
-            },
+async def test_sequential_thinking_tool(client):
+    # Test the sequentialthinking tool with a simple input
+    result = await client.call_tool(
+        "sequentialthinking",
+        {
+            "thought": "Analyze the core assumptions of the problem.",
+            "thoughtNumber": 1,
+            "totalThoughts": 5,
+            "nextThoughtNeeded": True,
+        },
+    )
+
+    # Verify that we got a response
+    assert result is not None
+
+    # Access the content from the CallToolResult object
+    response_content = result.content
+
+    # Verify that the response contains the expected fields
+    assert isinstance(response_content[0].text, str)
+
+
+def test_app_context_thoughts_by_number():
+    app_context = AppContext(team=create_sequential_thinking_team())
+    first = ThoughtData(
+        thought="Plan the analysis.",
+        thoughtNumber=1,
+        totalThoughts=5,
+        nextThoughtNeeded=True,
+    )
+    revision = ThoughtData(
+        thought="Refine the plan.",
+        thoughtNumber=2,
+        totalThoughts=5,
+        nextThoughtNeeded=True,
+        isRevision=True,
+        revisesThought=1,
+    )
+    app_context.add_thought(first)
+    app_context.add_thought(revision)
+
+    assert app_context.get_thought(1) is first
+    assert app_context.get_thought(2) is revision
+    assert app_context.get_thought(3) is None
+
+
+def test_app_context_branch_counts():
+    app_context = AppContext(team=create_sequential_thinking_team())
+    for thought_number in (2, 3):
+        app_context.add_thought(
+            ThoughtData(
+                thought="Explore an alternative.",
+                thoughtNumber=thought_number,
+                totalThoughts=5,
+                nextThoughtNeeded=True,
+                branchFromThought=1,
+                branchId="alt",
+            )
+        )
+
+    assert app_context.get_all_branches() == {"alt": 2}
+    assert len(app_context.get_branch_thoughts("alt")) == 2
+
+
+def test_app_context_bounded_branches():
+    app_context = AppContext(
+        team=create_sequential_thinking_team(), thought_history=deque(maxlen=2)
+    )
+    branch_thoughts = [
+        ThoughtData(
+            thought="Explore an alternative.",
+            thoughtNumber=thought_number,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+            branchFromThought=1,
+            branchId="alt",
         )
+        for thought_number in (2, 3)
+    ]
+    for thought in branch_thoughts:
+        app_context.add_thought(thought)
+    app_context.add_thought(
+        ThoughtData(
+            thought="Back on the main line.",
+            thoughtNumber=4,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+        )
+    )
+
+    # The evicted branch thought is released with the history
+    assert app_context.get_branch_thoughts("alt") == branch_thoughts[1:]
+    assert app_context.get_all_branches() == {"alt": 1}
+
+    app_context.add_thought(
+        ThoughtData(
+            thought="Still on the main line.",
+            thoughtNumber=5,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+        )
+    )
+    assert app_context.branches == {}
+    assert app_context.get_all_branches() == {}
+
+
+def test_app_context_bounded_history():
+    app_context = AppContext(
+        team=create_sequential_thinking_team(), thought_history=deque(maxlen=2)
+    )
+    thoughts = [
+        ThoughtData(
+            thought=f"Thought {thought_number}.",
+            thoughtNumber=thought_number,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+        )
+        for thought_number in (1, 2, 3)
+    ]
+    for thought in thoughts:
+        app_context.add_thought(thought)
+
+    assert list(app_context.thought_history) == thoughts[1:]
+    assert 1 not in app_context.thoughts_by_number
+    assert app_context.get_thought(3) is thoughts[2]
+
+    # A number reused by a later thought stays indexed while that thought is kept
+    app_context = AppContext(
+        team=create_sequential_thinking_team(), thought_history=deque(maxlen=2)
+    )
+    main, dup, third = (
+        ThoughtData(
+            thought=text,
+            thoughtNumber=thought_number,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+        )
+        for text, thought_number in (("main", 1), ("dup", 1), ("third", 3))
+    )
+    for thought in (main, dup, third):
+        app_context.add_thought(thought)
+
+    assert list(app_context.thought_history) == [dup, third]
+    assert app_context.get_thought(1) is dup
+    assert app_context.get_thought(3) is third
+    assert set(app_context.thoughts_by_number) == {1, 3}
+
+
+@pytest.mark.parametrize(
+    "fields, message",
+    [
+        (
+            {"revisesThought": 1},
+            "revisesThought can only be set when isRevision is True",
+        ),
+        (
+            {"isRevision": True, "revisesThought": 2},
+            "revisesThought must be less than thoughtNumber",
+        ),
+        (
+            {"branchId": "alt"},
+            "branchId can only be set when branchFromThought is set",
+        ),
+        (
+            {"branchFromThought": 2, "branchId": "alt"},
+            "branchFromThought must be less than thoughtNumber",
+        ),
+    ],
+)
+def test_thought_data_rejects_invalid_numbers(fields, message):
+    with pytest.raises(ValidationError, match=message):
+        ThoughtData(
+            thought="Check the numbering.",
+            thoughtNumber=2,
+            totalThoughts=5,
+            nextThoughtNeeded=True,
+            **fields,
+        )
+
+
+def test_team_is_cached():
+    team = create_sequential_thinking_team()
+    assert create_sequential_thinking_team() is team
+
+    clear_cache()
+    assert create_sequential_thinking_team() is not team
 
-        # Verify that we got a response
-        assert result is not None
 
-        # Access the content from the CallToolResult object
-        response_content = result.content if hasattr(result, "content") else result
+def test_team_dump_json():
+    dumped = json.loads(create_sequential_thinking_team().dump_json())
 
-        # Verify that the response contains the expected fields
-        assert isinstance(response_content[0].text, str)
+    assert dumped["name"] == "SequentialThinkingTeam"
+    assert [member["name"] for member in dumped["members"]] == [
+        "Planner",
+        "Researcher",
+        "Analyzer",
+        "Critic",
+        "Synthesizer",
+    ]
@@ -1,13 +1,9 @@
-import pytest
-
-from fastmcp.client import Client
-from fastapi.testclient import TestClient
-
-from src.main import app, mcp
+import dataclasses
 
+import pytest
 
-# for fastAPI tests
-tclient = TestClient(app)
+import src.main as main
+from src.main import app
 
 
 # for fastMCP tests
@@ -20,8 +16,8 @@ def mcp_server():
 
 # fastAPI tests
 @pytest.mark.asyncio
-async def test_fastapi_root():
-    response = tclient.get("/")
+async def test_fastapi_root(http):
+    response = await http.get("/")
     assert response.status_code == 200
     assert response.json() == {
         "service": "Highfeature Sequential Thinking MCP Service",
@@ -31,36 +27,90 @@ async def test_fastapi_root():
 
 
 @pytest.mark.asyncio
-async def test_fastapi_health():
-    response = tclient.get("/health-check")
+async def test_fastapi_health(http):
+    response = await http.get("/health-check")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
 
 # fastAPI tests
 @pytest.mark.asyncio
-async def test_fastapi_openapi_json_get():
-    response = tclient.get("/mcp/openapi.json")
+async def test_fastapi_openapi_json_get(http):
+    response = await http.get("/mcp/openapi.json")
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/json"
     assert "openapi" in response.json()
 
 
-async def test_sequential_thinking_tool() -> None:
+# log middleware tests
+@pytest.fixture
+def logged_bodies(monkeypatch):
+    """Records the request body the log middleware hands to log_request."""
+    bodies = []
+    monkeypatch.setattr(main, "log_request", lambda req: bodies.append(req.state.body))
+    return bodies
+
+
+@pytest.mark.asyncio
+async def test_log_middleware_small_json_body(http, logged_bodies):
+    await http.post("/mcp/openapi.json", json={"thought": "short"})
+    assert logged_bodies == [{"thought": "short"}]
+
+
+@pytest.mark.asyncio
+async def test_log_middleware_large_json_body(http, logged_bodies):
+    payload = {"thought": "x" * main.settings.LOG_BODY_MAX_BYTES}
+    response = await http.post("/mcp/openapi.json", json=payload)
+    size = len(response.request.content)
+    assert logged_bodies == [{"_truncated": True, "size": size}]
+
+
+@pytest.mark.asyncio
+async def test_log_middleware_skipped_path(http, logged_bodies, monkeypatch):
+    monkeypatch.setattr(
+        main,
+        "settings",
+        dataclasses.replace(
+            main.settings, LOG_BODY_SKIP_PATHS=frozenset({"/mcp/openapi.json"})
+        ),
+    )
+    response = await http.post("/mcp/openapi.json", json={"thought": "secret"})
+    size = len(response.request.content)
+    assert logged_bodies == [{"_truncated": True, "size": size}]
+
+
+@pytest.mark.asyncio
+async def test_log_middleware_non_json_body(http, logged_bodies):
+    response = await http.post(
+        "/mcp/openapi.json",
+        content=b"not json",
+        headers={"content-type": "text/plain"},
+    )
+    assert response.status_code != 500
+    assert logged_bodies == [{}]
+
+
+@pytest.mark.asyncio
+async def test_log_middleware_skips_probes_and_options(http, logged_bodies):
+    await http.get("/")
+    await http.get("/health-check")
+    await http.options("/mcp/openapi.json")
+    assert logged_bodies == []
+
+
+async def test_sequential_thinking_tool(client) -> None:
     """Tests the sequentialthinking tool with a simple input."""
-    # Create a client that connects directly to the server instance
-    async with Client(mcp) as client:
-        result = await client.call_tool(
-            "sequentialthinking",
-            {
-                "thought": "Analyze the core assumptions of the problem.",
-                "thoughtNumber": 1,
-                "totalThoughts": 5,
-                "nextThoughtNeeded": True,
-            },
-        )
-
-        print("\nTest: sequentialthinking")
-        print(f"Response type: {type(result)}")
-        if isinstance(result, str):
-            print(f"Response (truncated): {result[:200]}...")
+    result = await client.call_tool(
+        "sequentialthinking",
+        {
+            "thought": "Analyze the core assumptions of the problem.",
+            "thoughtNumber": 1,
+            "totalThoughts": 5,
+            "nextThoughtNeeded": True,
+        },
+    )
+
+    print("\nTest: sequentialthinking")
+    print(f"Response type: {type(result)}")
+    if isinstance(result, str):
+        print(f"Response (truncated): {result[:200]}...")